@@ -0,0 +1,33 @@
+/*
+ * Copyright (C) 2010-2019 The ESPResSo project
+ *
+ * This file is part of ESPResSo.
+ *
+ * ESPResSo is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * ESPResSo is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with this program.  If not, see <http://www.gnu.org/licenses/>.
+ */
+#ifndef ESPRESSO_FEATURES_FWD_HPP
+#define ESPRESSO_FEATURES_FWD_HPP
+
+/** \file
+ *
+ *  Declarations of the list of features compiled into ESPResSo. The list
+ *  is defined in the generated config-features.cpp. Include this header
+ *  instead of config.hpp when only the list is needed, to avoid depending
+ *  on the generated feature macros.
+ */
+
+extern const char *FEATURES[];
+extern const int NUM_FEATURES;
+
+#endif
@@ -18,13 +18,13 @@
 #
 # This script generates the files featureconfig.h and featureconfig.c.
 #
-import time
-import string
-import inspect
+import io
+import hashlib
+import pickle
 import sys
 import os
 # find featuredefs.py
-moduledir = os.path.dirname(inspect.getfile(inspect.currentframe()))
+moduledir = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(os.path.join(moduledir, '..'))
 import featuredefs
 
@@ -34,17 +34,88 @@ if len(sys.argv) != 4:
 
 deffilename, hfilename, cfilename = sys.argv[1:5]
 
-print("Reading definitions from " + deffilename + "...")
-defs = featuredefs.defs(deffilename)
-print("Done.")
+# the generated files only depend on the feature definitions and on the
+# generator itself; skip the generation if the key stored next to the
+# header matches, so that the mtimes of the generated files are left
+# untouched
+keyfilename = hfilename + '.key'
+codegen_key = hashlib.blake2b()
+for filename in (deffilename, __file__, featuredefs.__file__):
+    with open(filename, 'rb') as f:
+        codegen_key.update(f.read())
+codegen_marker = f"codegen-key: {codegen_key.hexdigest()}\n"
+
+if os.path.isfile(hfilename) and os.path.isfile(cfilename) \
+        and os.path.isfile(keyfilename):
+    with open(keyfilename, 'r') as f:
+        if f.read() == codegen_marker:
+            print(f"{hfilename} and {cfilename} are up to date.")
+            sys.exit(0)
+
+
+def write_if_changed(filename, content):
+    """Write ``content`` to ``filename`` unless the file already holds it.
+    The file is replaced atomically, and its mtime is only updated when
+    the content differs, so that the build system can skip recompiling
+    the files which depend on it.
+    """
+    if os.path.isfile(filename):
+        with open(filename, 'r') as f:
+            if f.read() == content:
+                print(f"{filename} is unchanged.")
+                return
+    tmpfilename = filename + '.tmp'
+    # use a buffer large enough to hold the whole file
+    with open(tmpfilename, 'w', buffering=1 << 20) as f:
+        f.write(content)
+    os.replace(tmpfilename, filename)
+
+
+# cache the parsed definitions in the build directory, keyed on the
+# content of the definition file and of the parser, and on the Python
+# version which wrote the pickle
+defs_key = hashlib.blake2b(repr(sys.version_info).encode())
+for filename in (deffilename, featuredefs.__file__):
+    with open(filename, 'rb') as f:
+        defs_key.update(f.read())
+defs_key = defs_key.hexdigest()
+defs_cachefilename = os.path.join(os.path.dirname(hfilename),
+                                  'featuredefs.pkl')
+
+defs = None
+if os.path.isfile(defs_cachefilename):
+    # an unreadable cache is not an error, the definitions are parsed again
+    try:
+        with open(defs_cachefilename, 'rb') as f:
+            cached_key, cached_defs = pickle.load(f)
+    except Exception:
+        cached_key, cached_defs = None, None
+    if cached_key == defs_key:
+        print("Reading cached definitions from " + defs_cachefilename)
+        defs = cached_defs
+
+if defs is None:
+    print("Reading definitions from " + deffilename + "...")
+    defs = featuredefs.defs(deffilename)
+    tmpfilename = defs_cachefilename + '.tmp'
+    with open(tmpfilename, 'wb') as f:
+        pickle.dump((defs_key, defs), f)
+    os.replace(tmpfilename, defs_cachefilename)
+    print("Done.")
+
+# sort the feature sets once, so that the generated files do not depend on
+# the set iteration order; implications, derivations and requirements are
+# kept in file order, since implications and derivations can be chained
+sorted_externals = sorted(defs.externals)
+sorted_allfeatures = sorted(defs.allfeatures)
 
 print("Writing " + hfilename + "...")
-hfile = open(hfilename, 'w')
+hfile = io.StringIO()
 
 hfile.write("""/*
 WARNING: This file was autogenerated by
 
-   %s on %s
+   %s
 
    Do not modify it or your changes will be overwritten!
    Modify features.def instead.
@@ -55,7 +126,7 @@ WARNING: This file was autogenerated by
 #include <cmake_config.hpp>
 #include "myconfig-final.hpp"
 
-""" % (sys.argv[0], time.asctime()))
+""" % sys.argv[0])
 
 # external features can only be set by the build
 # system, so in case the user has defined some of
@@ -63,14 +134,19 @@ WARNING: This file was autogenerated by
 # the config from the build system again, to make
 # sure only the detected ones are set.
 hfile.write('/* Guards for externals */')
-external_template = string.Template("""
-// $feature is external
-#if defined($feature)
-#undef $feature
+
+
+def external_template(feature):
+    return f"""
+// {feature} is external
+#if defined({feature})
+#undef {feature}
 #endif
-""")
-for feature in defs.externals:
-    hfile.write(external_template.substitute(feature=feature))
+"""
+
+
+hfile.write("".join(external_template(feature)
+                    for feature in sorted_externals))
 
 # Include definitions from CMake
 hfile.write("""
@@ -81,42 +157,47 @@ hfile.write("""
 
 # handle implications
 hfile.write('/* Handle implications */')
-implication_template = string.Template("""
-// $feature implies $implied
-#if defined($feature) && !defined($implied)
-#define $implied
+
+
+def implication_template(feature, implied):
+    return f"""
+// {feature} implies {implied}
+#if defined({feature}) && !defined({implied})
+#define {implied}
 #endif
-""")
-for feature, implied in defs.implications:
-    hfile.write(implication_template.substitute(
-        feature=feature, implied=implied))
+"""
+
+
+hfile.write("".join(implication_template(feature, implied)
+                    for feature, implied in defs.implications))
 
 # output warnings if internal features are set manually
 hfile.write('/* Warn when derived switches are specified manually */')
-derivation_template = string.Template("""
-// $feature equals $expr
-#ifdef $feature
-#warning $feature is a derived switch and should not be set manually!
-#elif $cppexpr
-#define $feature
+
+
+def derivation_template(feature, expr, cppexpr):
+    return f"""
+// {feature} equals {expr}
+#ifdef {feature}
+#warning {feature} is a derived switch and should not be set manually!
+#elif {cppexpr}
+#define {feature}
 #endif
-""")
-for feature, expr, cppexpr in defs.derivations:
-    hfile.write(derivation_template.substitute(
-        feature=feature, cppexpr=cppexpr, expr=expr))
+"""
+
+
+hfile.write("".join(derivation_template(feature, expr, cppexpr)
+                    for feature, expr, cppexpr in defs.derivations))
 
 # write footer
-# define external FEATURES and NUM_FEATURES
+# FEATURES and NUM_FEATURES are declared in features_fwd.hpp
 hfile.write("""
-extern const char* FEATURES[];
-extern const int NUM_FEATURES;
-
 #endif /* of _FEATURECONFIG_HPP */""")
-hfile.close()
+write_if_changed(hfilename, hfile.getvalue())
 print("Done.")
 
 print("Writing " + cfilename + "...")
-cfile = open(cfilename, 'w')
+cfile = io.StringIO()
 
 # handle requirements
 
@@ -124,8 +205,6 @@ cfile.write(f"""/*
 WARNING: This file was autogenerated by
 
    {sys.argv[0]}
-   on
-   {time.asctime()}
 
    Do not modify it or your changes will be overwritten!
    Modify features.def instead.
@@ -133,21 +212,24 @@ WARNING: This file was autogenerated by
 
 /* config.hpp includes config-features.hpp and myconfig.hpp */
 #include "config.hpp"
+#include "features_fwd.hpp"
 
 """)
 
 cfile.write('/* Handle requirements */')
 
-requirement_string = """
+
+def requirement_template(feature, expr, cppexpr):
+    return f"""
 // {feature} requires {expr}
 #if defined({feature}) && !({cppexpr})
 #error Feature {feature} requires {expr}
 #endif
 """
-for feature, expr, cppexpr in defs.requirements:
-    cfile.write(
-        requirement_string.format(
-            feature=feature, cppexpr=cppexpr, expr=expr))
+
+
+cfile.write("".join(requirement_template(feature, expr, cppexpr)
+                    for feature, expr, cppexpr in defs.requirements))
 
 cfile.write("""
 
@@ -155,14 +237,19 @@ cfile.write("""
 const char* FEATURES[] = {
 """)
 
-feature_string = """
-#ifdef {feature}
+
+# the feature list needs one conditional block per feature: whether a
+# feature is defined cannot be tested inside a macro expansion, so the
+# list cannot be generated from an X-macro table
+def feature_template(feature):
+    return f"""#ifdef {feature}
   "{feature}",
 #endif
 """
 
-for feature in defs.externals.union(defs.features, defs.derived):
-    cfile.write(feature_string.format(feature=feature))
+
+cfile.write("".join(feature_template(feature)
+                    for feature in sorted_allfeatures))
 
 cfile.write("""
 };
@@ -170,5 +257,8 @@ cfile.write("""
 const int NUM_FEATURES = sizeof(FEATURES)/sizeof(char*);
 """)
 
-cfile.close()
+write_if_changed(cfilename, cfile.getvalue())
 print("Done.")
+
+with open(keyfilename, 'w') as f:
+    f.write(codegen_marker)
@@ -39,6 +39,10 @@ LB_PARAMS = {'agrid': AGRID,
              'ext_force_density': [0, DENS * G, 0]}
 # System setup
 RADIUS = 6 * AGRID
+SPHERE_VOLUME = 4. / 3. * np.pi * RADIUS**3
+EXT_FORCE_DENSITY = np.array(LB_PARAMS['ext_force_density'], dtype=float)
+BOX_CENTER = np.array([BOX_SIZE / 2] * 3)
+UNIT_VECTORS = np.eye(3)
 
 
 class Buoyancy(object):
@@ -48,34 +52,44 @@ class Buoyancy(object):
 
     """
     lbf = None
+    sphere = None
     system = espressomd.System(box_l=[BOX_SIZE] * 3)
     system.time_step = TIME_STEP
     system.cell_system.skin = 0.01
 
-    def test(self):
-        self.system.actors.clear()
-        self.system.lbboundaries.clear()
-        self.system.actors.add(self.lbf)
+    @classmethod
+    def setup_lb_fluid(cls, lbf):
+        """
+        Add the fluid, the walls and the sphere to the system. Called once
+        per test class from ``setUpClass()``.
 
-        # Setup walls
-        for i in range(3):
-            n = np.zeros(3)
-            n[i] = 1
-            self.system.lbboundaries.add(espressomd.lbboundaries.LBBoundary(
-                                         shape=espressomd.shapes.Wall(
-                                             normal=-n, dist=-(self.system.box_l[i] - AGRID))))
+        """
+        cls.lbf = lbf
+        cls.system.actors.clear()
+        cls.system.lbboundaries.clear()
+        cls.system.actors.add(cls.lbf)
 
-            self.system.lbboundaries.add(espressomd.lbboundaries.LBBoundary(
-                                         shape=espressomd.shapes.Wall(
-                                             normal=n, dist=AGRID)))
+        # Setup walls
+        box_l = cls.system.box_l
+        walls = [(-UNIT_VECTORS[i], -(box_l[i] - AGRID),
+                  UNIT_VECTORS[i], AGRID) for i in range(3)]
+        for n_neg, d_neg, n_pos, d_pos in walls:
+            cls.system.lbboundaries.add(espressomd.lbboundaries.LBBoundary(
+                                        shape=espressomd.shapes.Wall(
+                                            normal=n_neg, dist=d_neg)))
+
+            cls.system.lbboundaries.add(espressomd.lbboundaries.LBBoundary(
+                                        shape=espressomd.shapes.Wall(
+                                            normal=n_pos, dist=d_pos)))
 
         # setup sphere without slip in the middle
-        sphere = espressomd.lbboundaries.LBBoundary(shape=espressomd.shapes.Sphere(
-            radius=RADIUS, center=self.system.box_l / 2, direction=1))
+        cls.sphere = espressomd.lbboundaries.LBBoundary(shape=espressomd.shapes.Sphere(
+            radius=RADIUS, center=BOX_CENTER, direction=1))
 
-        self.system.lbboundaries.add(sphere)
+        cls.system.lbboundaries.add(cls.sphere)
 
-        sphere_volume = 4. / 3. * np.pi * RADIUS**3
+    def test(self):
+        sphere = self.sphere
 
         # Equilibration
         last_force = np.inf * np.ones(3)
@@ -94,7 +108,7 @@ class Buoyancy(object):
 
         fluid_nodes = tests_common.count_fluid_nodes(self.lbf)
         fluid_volume = fluid_nodes * AGRID**3
-        applied_force = fluid_volume * np.array(LB_PARAMS['ext_force_density'])
+        applied_force = fluid_volume * EXT_FORCE_DENSITY
 
         np.testing.assert_allclose(
             boundary_force,
@@ -103,7 +117,7 @@ class Buoyancy(object):
 
         # Check buoyancy force on the sphere
         expected_force = np.array(
-            [0, -sphere_volume * DENS * G, 0])
+            [0, -SPHERE_VOLUME * DENS * G, 0])
         np.testing.assert_allclose(
             np.copy(sphere.get_force()), expected_force,
             atol=np.linalg.norm(expected_force) * 0.02)
@@ -113,15 +127,17 @@ class Buoyancy(object):
 @utx.skipIfMissingFeatures(["LB_BOUNDARIES_GPU", "EXTERNAL_FORCES"])
 class LBGPUBuoyancy(ut.TestCase, Buoyancy):
 
-    def setUp(self):
-        self.lbf = espressomd.lb.LBFluidGPU(**LB_PARAMS)
+    @classmethod
+    def setUpClass(cls):
+        cls.setup_lb_fluid(espressomd.lb.LBFluidGPU(**LB_PARAMS))
 
 
 @utx.skipIfMissingFeatures(["LB_BOUNDARIES", "EXTERNAL_FORCES"])
 class LBCPUBuoyancy(ut.TestCase, Buoyancy):
 
-    def setUp(self):
-        self.lbf = espressomd.lb.LBFluid(**LB_PARAMS)
+    @classmethod
+    def setUpClass(cls):
+        cls.setup_lb_fluid(espressomd.lb.LBFluid(**LB_PARAMS))
 
 
 if __name__ == "__main__":